@@ -16,11 +16,15 @@ import pandas as pd
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import logging
-import time
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from ..utils.cache import DiskCache
+from ..utils.json_parsing import parse_json
+from ..utils.rate_limit import TokenBucket
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,28 +32,30 @@ logger = logging.getLogger(__name__)
 # GLOBAL THREAD-SAFE RATE LIMITER
 # ==============================================================================
 
-class GlobalRateLimiter:
-    """
-    Thread-safe rate limiter to prevent API bombardment.
-    Ensures we don't exceed Hub'Eau API rate limits.
+# Un token bucket partagé par configuration (rate_limit, burst) pour tout le processus :
+# seuls les clients configurés à l'identique (ex: sessions Streamlit aux mêmes réglages)
+# partagent leur débit. Des clients aux réglages différents (ex: validateur aux valeurs
+# par défaut) ont chacun leur bucket et cumulent leurs débits sur le quota Hub'Eau.
+_rate_limiters: Dict[tuple, TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def _get_rate_limiter(rate_limit: float, burst: int) -> TokenBucket:
     """
-    _lock = threading.Lock()
-    _last_request_time = 0.0
+    Retourne le token bucket partagé pour cette configuration (créé au premier appel).
 
-    @classmethod
-    def wait(cls, rate_limit: float):
-        """
-        Thread-safe rate limiting.
+    Args:
+        rate_limit: Délai minimum moyen entre requêtes (secondes)
+        burst: Nombre de requêtes pouvant partir sans attente
 
-        Args:
-            rate_limit: Minimum seconds between requests
-        """
-        with cls._lock:
-            elapsed = time.time() - cls._last_request_time
-            if elapsed < rate_limit:
-                sleep_time = rate_limit - elapsed
-                time.sleep(sleep_time)
-            cls._last_request_time = time.time()
+    Returns:
+        TokenBucket partagé
+    """
+    key = (rate_limit, burst)
+    with _rate_limiters_lock:
+        if key not in _rate_limiters:
+            _rate_limiters[key] = TokenBucket.from_interval(rate_limit, capacity=burst)
+        return _rate_limiters[key]
 
 
 # ==============================================================================
@@ -67,17 +73,43 @@ class HubEauClient:
     STATIONS_ENDPOINT = '/stations'
     CHRONIQUES_ENDPOINT = '/chroniques'
 
-    def __init__(self, timeout: int = 30, rate_limit: float = 0.1):
+    # Durée de validité des attributs stations en cache (libellé, commune... peuvent
+    # être corrigés côté Hub'Eau)
+    STATIONS_CACHE_MAX_AGE = 7 * 24 * 3600
+
+    def __init__(
+        self,
+        timeout: int = 30,
+        rate_limit: float = 0.1,
+        max_workers: int = 4,
+        cache_dir: Optional[str] = None,
+        burst: Optional[int] = None
+    ):
         """
         Initialise le client Hub'Eau Piézométrie.
 
         Args:
             timeout: Timeout requêtes HTTP en secondes
-            rate_limit: Délai minimum entre requêtes (secondes)
+            rate_limit: Délai minimum moyen entre requêtes (secondes)
+            max_workers: Nombre max de requêtes chroniques en vol simultanément
+            cache_dir: Répertoire du cache disque des attributs stations (None = désactivé)
+            burst: Requêtes pouvant partir sans attente (None = max_workers)
         """
         self.base_url = self.BASE_URL
         self.timeout = timeout
         self.rate_limit = rate_limit
+        self.max_workers = max(1, max_workers)
+
+        # Token bucket : les workers démarrent ensemble, le débit moyen reste plafonné
+        self.burst = max(1, burst if burst is not None else self.max_workers)
+        self.rate_limiter = _get_rate_limiter(rate_limit, self.burst)
+
+        # Attributs stations quasi statiques : mis en cache par code BSS, rafraîchis
+        # après STATIONS_CACHE_MAX_AGE
+        self.stations_cache = (
+            DiskCache(cache_dir, 'hubeau_stations', max_age=self.STATIONS_CACHE_MAX_AGE)
+            if cache_dir else None
+        )
 
         # Setup session with connection pooling and retry logic
         self.session = requests.Session()
@@ -86,28 +118,37 @@ class HubEauClient:
         retry_strategy = Retry(
             total=5,  # Max 5 retries
             backoff_factor=2,  # 2^x seconds between retries
+            backoff_jitter=1.0,  # Désynchronise les workers qui échouent ensemble
             status_forcelist=[429, 500, 502, 503, 504],  # HTTP codes to retry
+            respect_retry_after_header=True,  # Attente imposée par le serveur (429/503)
             allowed_methods=["GET"]
         )
 
+        # Pool dimensionné pour que chaque worker garde sa connexion keep-alive
         adapter = HTTPAdapter(
             max_retries=retry_strategy,
             pool_connections=10,
-            pool_maxsize=10
+            pool_maxsize=max(10, self.max_workers)
         )
 
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
+        # requests annonce déjà gzip/deflate (Accept-Encoding), plus br si brotli est
+        # installé (extra "fast") : on ne force pas l'en-tête pour ne jamais annoncer
+        # un encodage non décodable, on précise seulement le format attendu
+        self.session.headers.update({"Accept": "application/json"})
+
         logger.info(
             f"Initialized HubEauClient for Piezometry "
-            f"(timeout={timeout}s, rate_limit={rate_limit}s)"
+            f"(timeout={timeout}s, rate_limit={rate_limit}s, burst={self.burst}, "
+            f"max_workers={self.max_workers})"
         )
 
     def _make_request(
         self,
         url: str,
-        params: Dict[str, Any],
+        params: Optional[Dict[str, Any]],
         context: str = ""
     ) -> Optional[requests.Response]:
         """
@@ -115,17 +156,17 @@ class HubEauClient:
 
         Args:
             url: URL to request
-            params: Query parameters
+            params: Query parameters (None when the URL already carries them)
             context: Context string for logging
 
         Returns:
             Response object or None if error
         """
         # Apply rate limiting
-        GlobalRateLimiter.wait(self.rate_limit)
+        self.rate_limiter.acquire()
 
         try:
-            logger.debug(f"{context} - Requesting: {url} with params: {params}")
+            logger.debug("%s - Requesting: %s with params: %s", context, url, params)
             response = self.session.get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
             return response
@@ -159,18 +200,37 @@ class HubEauClient:
             logger.warning("get_stations called with empty codes_bss list")
             return pd.DataFrame()
 
+        # Dédoublonnage en conservant l'ordre : un code répété ne doit pas être demandé
+        # deux fois (ni produire des mesures dupliquées)
+        codes_bss = list(dict.fromkeys(codes_bss))
+
         logger.info(f"Fetching piezometric station data for {len(codes_bss)} stations")
 
         url = self.base_url + self.STATIONS_ENDPOINT
 
+        all_data = []
+
+        # Stations déjà en cache disque : seules les autres sont demandées à l'API
+        codes_to_fetch = codes_bss
+        if self.stations_cache is not None:
+            codes_to_fetch = []
+            for code in codes_bss:
+                cached = self.stations_cache.get(code)
+                if cached is None:
+                    codes_to_fetch.append(code)
+                else:
+                    all_data.append(cached)
+            logger.info(
+                f"Stations cache: {len(all_data)} hits, {len(codes_to_fetch)} to fetch"
+            )
+
         # Hub'Eau accepte max ~50 codes par requête
         batch_size = 50
-        all_data = []
 
-        num_batches = (len(codes_bss) + batch_size - 1) // batch_size
+        num_batches = (len(codes_to_fetch) + batch_size - 1) // batch_size
 
-        for i in range(0, len(codes_bss), batch_size):
-            batch = codes_bss[i:i+batch_size]
+        for i in range(0, len(codes_to_fetch), batch_size):
+            batch = codes_to_fetch[i:i+batch_size]
             batch_num = i // batch_size + 1
 
             params = {
@@ -190,12 +250,17 @@ class HubEauClient:
                 continue
 
             try:
-                data = response.json()
+                data = parse_json(response)
 
                 # Extraction données selon structure API
                 if 'data' in data:
                     all_data.extend(data['data'])
-                    logger.debug(f"Batch {batch_num}: Got {len(data['data'])} stations")
+                    logger.debug("Batch %d: Got %d stations", batch_num, len(data['data']))
+
+                    if self.stations_cache is not None:
+                        for record in data['data']:
+                            if record.get('code_bss'):
+                                self.stations_cache.set(record['code_bss'], record)
                 else:
                     logger.warning(f"Batch {batch_num}: No 'data' field in response")
 
@@ -207,6 +272,11 @@ class HubEauClient:
             logger.warning("No station data retrieved from API")
             return pd.DataFrame()
 
+        # Extraire coordonnées GPS à l'ingestion, avant la construction du DataFrame :
+        # longitude/latitude arrivent directement comme colonnes scalaires
+        for record in all_data:
+            self._extract_coordinates(record)
+
         df = pd.DataFrame(all_data)
         logger.info(f"Successfully retrieved {len(df)} station records")
 
@@ -215,40 +285,52 @@ class HubEauClient:
             logger.error("No 'code_bss' column found in response")
             return pd.DataFrame()
 
-        # Extraire coordonnées GPS depuis geometry ou x/y
-        # L'API Hub'Eau retourne 'x' (longitude) et 'y' (latitude) en WGS84
-        # ET un champ 'geometry' avec les coordonnées
-        if 'geometry' in df.columns:
-            # Extraire depuis geometry (plus fiable)
-            def extract_coords(geom):
-                """Extract lat/lon from geometry object."""
-                if isinstance(geom, dict) and 'coordinates' in geom:
-                    coords = geom['coordinates']
-                    if isinstance(coords, list) and len(coords) >= 2:
-                        return pd.Series({'longitude': coords[0], 'latitude': coords[1]})
-                return pd.Series({'longitude': None, 'latitude': None})
-
-            coords_df = df['geometry'].apply(extract_coords)
-            df['longitude'] = pd.to_numeric(coords_df['longitude'], errors='coerce')
-            df['latitude'] = pd.to_numeric(coords_df['latitude'], errors='coerce')
-            logger.debug("Extracted GPS coordinates from geometry field")
-
-        elif 'x' in df.columns and 'y' in df.columns:
-            # Fallback: utiliser x (longitude) et y (latitude)
-            df['longitude'] = pd.to_numeric(df['x'], errors='coerce')
-            df['latitude'] = pd.to_numeric(df['y'], errors='coerce')
-            logger.debug("Extracted GPS coordinates from x/y fields")
+        # No-op si les valeurs sont déjà des float ; force NaN pour None / valeurs invalides
+        df['longitude'] = pd.to_numeric(df['longitude'], errors='coerce')
+        df['latitude'] = pd.to_numeric(df['latitude'], errors='coerce')
 
-        else:
+        if df['latitude'].isna().all():
             logger.warning("No GPS coordinate fields (geometry, x/y) found in station data")
 
         return df
 
+    @staticmethod
+    def _day_key(dates: pd.Series) -> pd.Series:
+        """
+        Clé journalière (minuit, naïve) depuis des dates de mesure parsées.
+
+        Reste en datetime64 (vectorisé) plutôt qu'en objets date Python (.dt.date) ;
+        la conversion en dates calendaires n'a lieu qu'en fin de construction du dataset.
+        """
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+        return dates.dt.normalize()
+
+    @staticmethod
+    def _extract_coordinates(record: Dict[str, Any]):
+        """
+        Ajoute 'longitude' et 'latitude' à un enregistrement station (en place).
+
+        L'API Hub'Eau retourne un champ 'geometry' (GeoJSON, plus fiable) ET 'x'
+        (longitude) / 'y' (latitude) en WGS84, utilisés en repli.
+
+        Args:
+            record: Enregistrement station brut de l'API
+        """
+        geometry = record.get('geometry')
+        coords = geometry.get('coordinates') if isinstance(geometry, dict) else None
+
+        if isinstance(coords, list) and len(coords) >= 2:
+            record['longitude'], record['latitude'] = coords[0], coords[1]
+        else:
+            record['longitude'], record['latitude'] = record.get('x'), record.get('y')
+
     def get_chroniques(
         self,
         code_bss: str,
         date_debut: datetime,
-        date_fin: datetime
+        date_fin: datetime,
+        fields: Optional[List[str]] = None
     ) -> pd.DataFrame:
         """
         Récupère les chroniques de niveaux de nappe pour une station.
@@ -257,73 +339,51 @@ class HubEauClient:
             code_bss: Code BSS de la station (ex: "07548X0009/F")
             date_debut: Date de début
             date_fin: Date de fin
+            fields: Champs API à retourner (None = tous)
 
         Returns:
             DataFrame avec chroniques (date_mesure, niveau_nappe_ngf, profondeur_nappe, etc.)
         """
         logger.debug(
-            f"Fetching chroniques for station {code_bss} "
-            f"from {date_debut.date()} to {date_fin.date()}"
+            "Fetching chroniques for station %s from %s to %s",
+            code_bss, date_debut.date(), date_fin.date()
         )
 
-        url = self.base_url + self.CHRONIQUES_ENDPOINT
-
-        params = {
-            'code_bss': code_bss,
-            'size': 20000,
-            'date_debut_mesure': date_debut.strftime("%Y-%m-%d"),
-            'date_fin_mesure': date_fin.strftime("%Y-%m-%d")
-        }
-
-        response = self._make_request(
-            url,
-            params,
-            context=f"Chroniques for {code_bss}"
+        records = self._fetch_chroniques_batch(
+            self.base_url + self.CHRONIQUES_ENDPOINT,
+            [code_bss],
+            self._chroniques_base_params(date_debut, date_fin, fields),
+            f"Chroniques for {code_bss}"
         )
 
-        if not response:
+        if not records:
             return pd.DataFrame()
 
-        try:
-            data = response.json()
-
-            if 'data' in data:
-                df = pd.DataFrame(data['data'])
-                logger.debug(f"Station {code_bss}: Got {len(df)} measurement records")
-            else:
-                logger.warning(f"Station {code_bss}: No 'data' field in response")
-                df = pd.DataFrame()
-
-            if not df.empty:
-                # Normaliser colonnes dates
-                if 'date_mesure' in df.columns:
-                    df['date_mesure'] = pd.to_datetime(df['date_mesure'], errors='coerce')
-                    # Créer colonne date unifiée (sans heure)
-                    df['date'] = df['date_mesure'].dt.date
+        df = self._records_to_frame(records, fields)
 
-                # Normaliser colonne code
-                df['code_bss'] = code_bss
+        # Normaliser colonne code
+        df['code_bss'] = code_bss
 
-            return df
-
-        except (ValueError, KeyError) as e:
-            logger.error(f"Station {code_bss}: Error parsing response: {e}")
-            return pd.DataFrame()
+        return df
 
     def get_chroniques_batch(
         self,
         codes_bss: List[str],
         date_debut: datetime,
-        date_fin: datetime
+        date_fin: datetime,
+        fields: Optional[List[str]] = None
     ) -> pd.DataFrame:
         """
         Récupère les chroniques pour plusieurs stations piézométriques.
-        Optimisé: Utilise l'API batch avec plusieurs codes BSS par requête.
+        Optimisé: Utilise l'API batch avec plusieurs codes BSS par requête,
+        les batchs étant envoyés en parallèle (max_workers threads).
 
         Args:
             codes_bss: Liste des codes BSS
             date_debut: Date de début
             date_fin: Date de fin
+            fields: Champs API à retourner (None = tous). Réduit la taille des
+                réponses quand seuls quelques champs sont exportés.
 
         Returns:
             DataFrame concatené avec toutes les chroniques
@@ -332,6 +392,10 @@ class HubEauClient:
             logger.warning("get_chroniques_batch called with empty codes_bss list")
             return pd.DataFrame()
 
+        # Dédoublonnage en conservant l'ordre : un code répété ne doit pas être demandé
+        # deux fois (ni produire des mesures dupliquées)
+        codes_bss = list(dict.fromkeys(codes_bss))
+
         logger.info(
             f"Fetching chroniques for {len(codes_bss)} piezometric stations "
             f"from {date_debut.date()} to {date_fin.date()}"
@@ -342,77 +406,195 @@ class HubEauClient:
         # Hub'Eau accepte plusieurs codes BSS dans une requête (séparés par virgule)
         # On va faire des batchs de 20 codes pour équilibrer taille réponse et nombre de requêtes
         batch_size = 20
-        all_data = []
+        batches = [codes_bss[i:i+batch_size] for i in range(0, len(codes_bss), batch_size)]
+        num_batches = len(batches)
+
+        # Enregistrements bruts rangés par index de batch pour un ordre de sortie
+        # déterministe ; un seul DataFrame est construit à la fin (pas de pd.concat)
+        results: List[Optional[List[Dict[str, Any]]]] = [None] * num_batches
         success_count = 0
         fail_count = 0
-
-        num_batches = (len(codes_bss) + batch_size - 1) // batch_size
-
-        for i in range(0, len(codes_bss), batch_size):
-            batch = codes_bss[i:i+batch_size]
-            batch_num = i // batch_size + 1
-
-            params = {
-                'code_bss': ','.join(batch),
-                'size': 20000,
-                'date_debut_mesure': date_debut.strftime("%Y-%m-%d"),
-                'date_fin_mesure': date_fin.strftime("%Y-%m-%d")
+        processed = 0
+
+        # Les batchs sont envoyés en parallèle : le token bucket (thread-safe) laisse
+        # partir une première rafale puis espace les départs de requêtes
+        max_workers = min(self.max_workers, num_batches)
+
+        # Paramètres communs (dates formatées, champs) construits une seule fois
+        base_params = self._chroniques_base_params(date_debut, date_fin, fields)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._fetch_chroniques_batch,
+                    url,
+                    batch,
+                    base_params,
+                    f"Chroniques Batch {batch_num}/{num_batches}"
+                ): batch_num
+                for batch_num, batch in enumerate(batches, 1)
             }
 
-            response = self._make_request(
-                url,
-                params,
-                context=f"Chroniques Batch {batch_num}/{num_batches}"
-            )
+            for future in as_completed(futures):
+                batch_num = futures[future]
+                batch = batches[batch_num - 1]
+                records = future.result()
+                processed += len(batch)
 
-            if not response:
-                logger.warning(f"Batch {batch_num}/{num_batches} failed, skipping {len(batch)} stations")
-                fail_count += len(batch)
-                continue
-
-            try:
-                data = response.json()
-
-                if 'data' in data and data['data']:
-                    df = pd.DataFrame(data['data'])
-
-                    # Normaliser colonnes dates
-                    if 'date_mesure' in df.columns:
-                        df['date_mesure'] = pd.to_datetime(df['date_mesure'], errors='coerce')
-                        df['date'] = df['date_mesure'].dt.date
-
-                    all_data.append(df)
+                if records is None:
+                    fail_count += len(batch)
+                else:
+                    results[batch_num - 1] = records
 
                     # Compter les stations avec des données
-                    stations_with_data = df['code_bss'].nunique() if 'code_bss' in df.columns else 0
+                    stations_with_data = len({r['code_bss'] for r in records if r.get('code_bss')})
                     success_count += stations_with_data
                     fail_count += len(batch) - stations_with_data
 
-                    logger.debug(f"Batch {batch_num}: Got {len(df)} records from {stations_with_data} stations")
-                else:
-                    logger.warning(f"Batch {batch_num}: No data returned for {len(batch)} stations")
-                    fail_count += len(batch)
-
-            except (ValueError, KeyError) as e:
-                logger.error(f"Batch {batch_num}: Error parsing response: {e}")
-                fail_count += len(batch)
-                continue
+                # Log progress
+                logger.info(
+                    f"Progress: {processed}/{len(codes_bss)} stations "
+                    f"({success_count} success, {fail_count} no data)"
+                )
 
-            # Log progress
-            total_processed = min((batch_num) * batch_size, len(codes_bss))
-            logger.info(
-                f"Progress: {total_processed}/{len(codes_bss)} stations "
-                f"({success_count} success, {fail_count} no data)"
-            )
+        all_records = [record for records in results if records for record in records]
 
-        if not all_data:
+        if not all_records:
             logger.warning("No chroniques data retrieved for any station")
             return pd.DataFrame()
 
-        result = pd.concat(all_data, ignore_index=True)
+        result = self._records_to_frame(all_records, fields)
+
         logger.info(
             f"Successfully retrieved chroniques: {len(result)} total records "
             f"from {success_count}/{len(codes_bss)} stations"
         )
 
         return result
+
+    def _records_to_frame(
+        self,
+        records: List[Dict[str, Any]],
+        fields: Optional[List[str]]
+    ) -> pd.DataFrame:
+        """
+        Construit le DataFrame chroniques à partir des enregistrements bruts.
+
+        Args:
+            records: Enregistrements bruts de l'API
+            fields: Champs API demandés (None = tous)
+
+        Returns:
+            DataFrame avec date_mesure parsée et clé journalière 'date'
+        """
+        if fields:
+            # Schéma connu (projection API) : construction colonne par colonne, sans
+            # union des clés de chaque enregistrement ni transposition lignes→colonnes
+            df = pd.DataFrame({
+                field: [record.get(field) for record in records]
+                for field in dict.fromkeys(fields)
+            })
+        else:
+            df = pd.DataFrame(records)
+
+        # Normaliser colonnes dates (un seul parsing pour toutes les pages / batchs)
+        # Hub'Eau renvoie de l'ISO 8601 : format explicite = chemin C, sans inférence
+        if 'date_mesure' in df.columns:
+            df['date_mesure'] = pd.to_datetime(
+                df['date_mesure'], format='ISO8601', cache=True, errors='coerce'
+            )
+            # Créer colonne date unifiée (sans heure)
+            df['date'] = self._day_key(df['date_mesure'])
+
+        return df
+
+    @staticmethod
+    def _chroniques_base_params(
+        date_debut: datetime,
+        date_fin: datetime,
+        fields: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """
+        Paramètres de requête chroniques communs à tous les batchs (hors code_bss).
+
+        Args:
+            date_debut: Date de début
+            date_fin: Date de fin
+            fields: Champs API à retourner (None = tous)
+
+        Returns:
+            Dict de paramètres, à ne pas modifier (partagé entre threads)
+        """
+        base_params = {
+            'size': 20000,
+            'date_debut_mesure': date_debut.strftime("%Y-%m-%d"),
+            'date_fin_mesure': date_fin.strftime("%Y-%m-%d")
+        }
+        if fields:
+            base_params['fields'] = ','.join(fields)
+        return base_params
+
+    def _fetch_chroniques_batch(
+        self,
+        url: str,
+        batch: List[str],
+        base_params: Dict[str, Any],
+        context: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Récupère les chroniques d'un batch de codes BSS, pages suivantes comprises
+        (thread-safe). Utilisé aussi par get_chroniques avec un batch d'un seul code.
+
+        Args:
+            url: URL de l'endpoint chroniques
+            batch: Codes BSS du batch
+            base_params: Paramètres communs (voir _chroniques_base_params)
+            context: Contexte pour les logs
+
+        Returns:
+            Enregistrements bruts du batch (toutes pages), ou None si échec de la
+            première page / aucune donnée
+        """
+        params = {'code_bss': ','.join(batch), **base_params}
+
+        records = []
+        page = 1
+
+        # Pagination : suivre le lien 'next' (URL complète, paramètres inclus) pour ne
+        # pas tronquer silencieusement les réponses de plus de 'size' mesures
+        while url:
+            page_context = context if page == 1 else f"{context} (page {page})"
+            response = self._make_request(url, params, context=page_context)
+
+            if not response:
+                if page == 1:
+                    logger.warning(f"{context} failed, skipping {len(batch)} stations")
+                    return None
+                logger.warning(f"{page_context} failed, keeping {len(records)} records")
+                break
+
+            try:
+                data = parse_json(response)
+            except ValueError as e:
+                logger.error(f"{page_context}: Error parsing response: {e}")
+                if page == 1:
+                    return None
+                break
+
+            if not isinstance(data, dict) or not data.get('data'):
+                break
+
+            # Enregistrements laissés bruts : DataFrame et dates sont construits
+            # une seule fois sur le résultat complet
+            records.extend(data['data'])
+            logger.debug("%s: Got %d records", page_context, len(data['data']))
+
+            url = data.get('next')
+            params = None
+            page += 1
+
+        if not records:
+            logger.warning(f"{context}: No data returned for {len(batch)} stations")
+            return None
+
+        return records
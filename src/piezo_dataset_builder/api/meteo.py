@@ -11,14 +11,18 @@ Features:
 """
 
 import requests
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
 import logging
-import time
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from ..utils.cache import DiskCache
+from ..utils.json_parsing import parse_json
+from ..utils.rate_limit import TokenBucket
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,17 +49,36 @@ class OpenMeteoClient:
         "radiation": "shortwave_radiation_sum",            # Rayonnement solaire (MJ/m²)
     }
 
-    def __init__(self, timeout: int = 30, rate_limit: float = 2.0):
+    # Poids max visé par requête multi-location. Open-Meteo compte chaque location comme
+    # max(1, jours/14) × max(1, variables/10) appels : on regroupe d'autant plus de
+    # locations que la période d'un chunk est courte
+    MAX_REQUEST_WEIGHT = 200.0
+    MAX_LOCATIONS_PER_REQUEST = 50
+
+    # Délai de consolidation des données d'archive : les périodes plus récentes peuvent
+    # encore évoluer et ne sont pas mises en cache
+    CACHE_MIN_AGE_DAYS = 7
+
+    def __init__(
+        self,
+        timeout: int = 30,
+        rate_limit: float = 2.0,
+        cache_dir: Optional[str] = None
+    ):
         """
         Initialise le client Open-Meteo.
 
         Args:
             timeout: Timeout requêtes HTTP en secondes
             rate_limit: Délai minimum entre requêtes (secondes) pour respecter API limits
+            cache_dir: Répertoire du cache disque des réponses (None = désactivé)
         """
         self.timeout = timeout
         self.rate_limit = rate_limit
-        self._last_request_time = 0.0
+        # Météo historique immuable : réponses mises en cache par point et période
+        self.cache = DiskCache(cache_dir, 'open_meteo') if cache_dir else None
+        # Requêtes séquentielles : bucket de capacité 1 = délai minimum entre requêtes
+        self.rate_limiter = TokenBucket.from_interval(rate_limit)
 
         # Setup session with connection pooling and retry logic
         self.session = requests.Session()
@@ -64,7 +87,9 @@ class OpenMeteoClient:
         retry_strategy = Retry(
             total=3,  # Max 3 retries (moins que HubEau car API plus stable)
             backoff_factor=1,
+            backoff_jitter=0.5,
             status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True,
             allowed_methods=["GET"]
         )
 
@@ -77,18 +102,100 @@ class OpenMeteoClient:
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
+        # Compression négociée par requests (gzip/deflate, br si brotli installé)
+        self.session.headers.update({"Accept": "application/json"})
+
         logger.info(
             f"Initialized OpenMeteoClient "
             f"(timeout={timeout}s, rate_limit={rate_limit}s)"
         )
 
-    def _apply_rate_limit(self):
-        """Apply rate limiting between requests."""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.rate_limit:
-            sleep_time = self.rate_limit - elapsed
-            time.sleep(sleep_time)
-        self._last_request_time = time.time()
+    def _cache_key(
+        self,
+        latitude: float,
+        longitude: float,
+        date_debut: datetime,
+        date_fin: datetime,
+        variables: Dict[str, str]
+    ) -> Optional[str]:
+        """
+        Clé de cache d'une réponse mono-location, ou None si non cachable.
+
+        Args:
+            latitude: Latitude
+            longitude: Longitude
+            date_debut: Date de début
+            date_fin: Date de fin
+            variables: Variables résolues {nom simplifié: nom API}
+
+        Returns:
+            Clé (point, période, variables API triées) ou None (cache désactivé,
+            période trop récente)
+        """
+        if self.cache is None:
+            return None
+        if date_fin > datetime.now() - timedelta(days=self.CACHE_MIN_AGE_DAYS):
+            return None
+        return (
+            f"{round(float(latitude), 6)},{round(float(longitude), 6)}|"
+            f"{date_debut:%Y-%m-%d}|{date_fin:%Y-%m-%d}|"
+            f"{','.join(sorted(variables.values()))}"
+        )
+
+    def _locations_per_request(self, n_days: int, n_variables: int) -> int:
+        """
+        Nombre de locations par requête pour rester sous MAX_REQUEST_WEIGHT.
+
+        Args:
+            n_days: Nombre de jours du chunk temporel le plus long
+            n_variables: Nombre de variables demandées
+
+        Returns:
+            Nombre de locations (entre 1 et MAX_LOCATIONS_PER_REQUEST)
+        """
+        weight_per_location = max(1.0, n_days / 14) * max(1.0, n_variables / 10)
+        return max(1, min(
+            self.MAX_LOCATIONS_PER_REQUEST,
+            int(self.MAX_REQUEST_WEIGHT // weight_per_location)
+        ))
+
+    @staticmethod
+    def _validate_batch(locations: List[Dict[str, float]]) -> Dict[str, np.ndarray]:
+        """
+        Valide les coordonnées de toutes les locations en une passe numpy.
+
+        Les valeurs manquantes ou non numériques deviennent NaN et sont rejetées avec
+        les coordonnées hors bornes ; les rejets sont journalisés une seule fois.
+
+        Args:
+            locations: Liste de dict avec 'latitude', 'longitude'
+
+        Returns:
+            Dict avec 'latitude', 'longitude' (float) et 'mask' (bool, True = valide)
+        """
+        lats = pd.to_numeric(
+            pd.Series([loc.get('latitude') for loc in locations], dtype=object),
+            errors='coerce'
+        ).to_numpy(dtype=float)
+        lons = pd.to_numeric(
+            pd.Series([loc.get('longitude') for loc in locations], dtype=object),
+            errors='coerce'
+        ).to_numpy(dtype=float)
+
+        mask = (
+            np.isfinite(lats) & np.isfinite(lons)
+            & (np.abs(lats) <= 90) & (np.abs(lons) <= 180)
+        )
+
+        n_invalid = int((~mask).sum())
+        if n_invalid:
+            invalid_idx = np.flatnonzero(~mask)
+            logger.warning(
+                f"{n_invalid} locations with missing or invalid coordinates skipped "
+                f"(indices: {invalid_idx[:10].tolist()}{'...' if n_invalid > 10 else ''})"
+            )
+
+        return {'latitude': lats, 'longitude': lons, 'mask': mask}
 
     def _validate_coordinates(self, latitude: float, longitude: float) -> bool:
         """
@@ -115,6 +222,36 @@ class OpenMeteoClient:
 
         return True
 
+    def _resolve_variables(self, variables: Optional[List[str]]) -> Dict[str, str]:
+        """
+        Valide, déduplique et résout les variables météo en une seule passe.
+
+        La résolution vers les noms API est faite une fois par appel public, puis
+        réutilisée par toutes les requêtes (chunks temporels et batches de locations).
+
+        Args:
+            variables: Liste de variables (None = precipitation, temperature, ET)
+
+        Returns:
+            Dict ordonné {nom simplifié: nom API} des variables reconnues
+        """
+        if variables is None:
+            variables = ["precipitation", "temperature", "evapotranspiration"]
+
+        resolved = {}
+        invalid_vars = []
+        for v in dict.fromkeys(variables):  # Dédoublonnage en conservant l'ordre
+            api_var = self.AVAILABLE_VARIABLES.get(v)
+            if api_var:
+                resolved[v] = api_var
+            else:
+                invalid_vars.append(v)
+
+        if invalid_vars:
+            logger.warning(f"Variables non reconnues (ignorées): {invalid_vars}")
+
+        return resolved
+
     def _split_date_range(self, date_debut: datetime, date_fin: datetime, chunk_years: int = 10):
         """
         Divise une plage de dates en chunks pour réduire le poids des requêtes API.
@@ -173,16 +310,7 @@ class OpenMeteoClient:
         if not self._validate_coordinates(latitude, longitude):
             return pd.DataFrame()
 
-        # Variables par défaut
-        if variables is None:
-            variables = ["precipitation", "temperature", "evapotranspiration"]
-
-        # Validation variables
-        invalid_vars = [v for v in variables if v not in self.AVAILABLE_VARIABLES]
-        if invalid_vars:
-            logger.warning(f"Variables non reconnues (ignorées): {invalid_vars}")
-            variables = [v for v in variables if v in self.AVAILABLE_VARIABLES]
-
+        variables = self._resolve_variables(variables)
         if not variables:
             logger.warning("No valid variables specified")
             return pd.DataFrame()
@@ -221,7 +349,7 @@ class OpenMeteoClient:
         longitude: float,
         date_debut: datetime,
         date_fin: datetime,
-        variables: List[str]
+        variables: Dict[str, str]
     ) -> pd.DataFrame:
         """
         Récupère un chunk de données météo (méthode interne).
@@ -231,13 +359,13 @@ class OpenMeteoClient:
             longitude: Longitude
             date_debut: Date de début
             date_fin: Date de fin
-            variables: Liste de variables validées
+            variables: Variables résolues {nom simplifié: nom API}
 
         Returns:
             DataFrame avec données météo
         """
-        # Mapping vers noms API
-        api_variables = [self.AVAILABLE_VARIABLES[v] for v in variables]
+        cache_key = self._cache_key(latitude, longitude, date_debut, date_fin, variables)
+        data = self.cache.get(cache_key) if cache_key else None
 
         # Paramètres requête
         params = {
@@ -245,45 +373,48 @@ class OpenMeteoClient:
             "longitude": round(longitude, 6),
             "start_date": date_debut.strftime("%Y-%m-%d"),
             "end_date": date_fin.strftime("%Y-%m-%d"),
-            "daily": ",".join(api_variables),
+            "daily": ",".join(variables.values()),
             "timezone": "Europe/Paris"
         }
 
-        # Apply rate limiting
-        self._apply_rate_limit()
-
         try:
-            logger.debug(
-                f"Fetching weather data for ({latitude:.4f}, {longitude:.4f}) "
-                f"from {date_debut.date()} to {date_fin.date()}"
-            )
+            if data is None:
+                # Apply rate limiting
+                self.rate_limiter.acquire()
 
-            response = self.session.get(self.BASE_URL, params=params, timeout=self.timeout)
-            response.raise_for_status()
+                logger.debug(
+                    "Fetching weather data for (%.4f, %.4f) from %s to %s",
+                    latitude, longitude, date_debut.date(), date_fin.date()
+                )
 
-            data = response.json()
+                response = self.session.get(self.BASE_URL, params=params, timeout=self.timeout)
+                response.raise_for_status()
 
-            # Validation de la réponse
-            if 'daily' not in data or 'time' not in data['daily']:
-                logger.error(f"Malformed API response: missing 'daily' or 'time' keys")
-                return pd.DataFrame()
+                data = parse_json(response)
+
+                # Validation de la réponse
+                if 'daily' not in data or 'time' not in data['daily']:
+                    logger.error(f"Malformed API response: missing 'daily' or 'time' keys")
+                    return pd.DataFrame()
+
+                if cache_key:
+                    self.cache.set(cache_key, data)
 
             # Construire DataFrame
-            # pd.to_datetime() retourne déjà un DatetimeIndex/Series
-            time_data = pd.to_datetime(data['daily']['time'])
+            # Dates journalières en datetime64 (minuit), sans objets date Python
             df_data = {
-                'date': time_data.date if hasattr(time_data, 'date') else [d.date() for d in time_data]
+                'date': pd.to_datetime(data['daily']['time'], format='%Y-%m-%d')
             }
 
             # Ajouter variables avec noms simplifiés
-            for var_key, api_var in zip(variables, api_variables):
+            for var_key, api_var in variables.items():
                 if api_var in data['daily']:
                     df_data[var_key] = data['daily'][api_var]
                 else:
                     logger.warning(f"Variable '{api_var}' not found in API response")
 
             df = pd.DataFrame(df_data)
-            logger.debug(f"Retrieved {len(df)} weather records")
+            logger.debug("Retrieved %d weather records", len(df))
 
             return df
 
@@ -320,27 +451,69 @@ class OpenMeteoClient:
         locations: List[Dict[str, float]],
         date_debut: datetime,
         date_fin: datetime,
-        variables: List[str]
-    ) -> pd.DataFrame:
+        variables: Dict[str, str],
+        columns: Dict[str, list]
+    ) -> int:
         """
         Récupère données météo pour plusieurs localisations en UNE seule requête API.
         Open-Meteo supporte les coordonnées multiples séparées par des virgules.
 
+        Les valeurs sont ajoutées à l'accumulateur colonne par colonne ``columns``
+        (dates brutes ISO, non parsées) : l'appelant construit un unique DataFrame
+        une fois toutes les requêtes terminées, sans DataFrame intermédiaire.
+
         Args:
             locations: Liste de dict validés avec 'latitude', 'longitude', 'code_station'
             date_debut: Date de début
             date_fin: Date de fin
-            variables: Variables météo validées
+            variables: Variables résolues {nom simplifié: nom API}
+            columns: Accumulateur {colonne: liste de valeurs}, complété en place
 
         Returns:
-            DataFrame avec toutes les données météo
+            Nombre d'enregistrements ajoutés
         """
-        # Préparer les coordonnées séparées par virgules
-        latitudes = [str(round(float(loc['latitude']), 6)) for loc in locations]
-        longitudes = [str(round(float(loc['longitude']), 6)) for loc in locations]
+        # Réponses par location : cache disque d'abord, seules les autres sont demandées
+        cache_keys = [
+            self._cache_key(loc['latitude'], loc['longitude'], date_debut, date_fin, variables)
+            for loc in locations
+        ]
+        payloads = [self.cache.get(key) if key else None for key in cache_keys]
+        to_fetch = [i for i, payload in enumerate(payloads) if payload is None]
+
+        if to_fetch:
+            self._fetch_locations(locations, to_fetch, date_debut, date_fin, variables,
+                                  payloads, cache_keys)
+        else:
+            logger.debug("Weather data for %d locations served from cache", len(locations))
+
+        # Les locations en cache sont conservées même si la requête des autres échoue
+        return self._append_locations(locations, payloads, variables, columns)
+
+    def _fetch_locations(
+        self,
+        locations: List[Dict[str, float]],
+        to_fetch: List[int],
+        date_debut: datetime,
+        date_fin: datetime,
+        variables: Dict[str, str],
+        payloads: List[Optional[Dict]],
+        cache_keys: List[Optional[str]]
+    ):
+        """
+        Demande en une requête les locations absentes du cache (complète payloads en place).
 
-        # Mapping vers noms API
-        api_variables = [self.AVAILABLE_VARIABLES[v] for v in variables]
+        Args:
+            locations: Locations du batch
+            to_fetch: Index des locations à demander à l'API
+            date_debut: Date de début
+            date_fin: Date de fin
+            variables: Variables résolues {nom simplifié: nom API}
+            payloads: Réponse par location, complétée en place
+            cache_keys: Clé de cache par location (None = non cachable)
+        """
+        # Préparer les coordonnées séparées par virgules
+        latitudes = [str(round(float(locations[i]['latitude']), 6)) for i in to_fetch]
+        longitudes = [str(round(float(locations[i]['longitude']), 6)) for i in to_fetch]
 
         # Paramètres requête avec multiple locations
         params = {
@@ -348,91 +521,95 @@ class OpenMeteoClient:
             "longitude": ",".join(longitudes),
             "start_date": date_debut.strftime("%Y-%m-%d"),
             "end_date": date_fin.strftime("%Y-%m-%d"),
-            "daily": ",".join(api_variables),
+            "daily": ",".join(variables.values()),
             "timezone": "Europe/Paris"
         }
 
         # Apply rate limiting
-        self._apply_rate_limit()
+        self.rate_limiter.acquire()
 
         try:
             logger.debug(
-                f"Fetching weather data for {len(locations)} locations "
-                f"from {date_debut.date()} to {date_fin.date()} in single request"
+                "Fetching weather data for %d locations from %s to %s in single request",
+                len(to_fetch), date_debut.date(), date_fin.date()
             )
 
             response = self.session.get(self.BASE_URL, params=params, timeout=self.timeout)
             response.raise_for_status()
 
-            data = response.json()
+            data = parse_json(response)
 
-            # Avec multiple locations, la structure est différente
+            # Avec multiple locations, l'API renvoie une liste
             # data = [{"latitude": ..., "longitude": ..., "daily": {...}}, ...]
-            if isinstance(data, list):
-                # Mode multi-location
-                all_dfs = []
-                for i, location_data in enumerate(data):
-                    if 'daily' not in location_data or 'time' not in location_data['daily']:
-                        logger.warning(f"Location {i}: Malformed response, skipping")
-                        continue
-
-                    time_data = pd.to_datetime(location_data['daily']['time'])
-                    df_data = {
-                        'date': time_data.date if hasattr(time_data, 'date') else [d.date() for d in time_data],
-                        'latitude': location_data.get('latitude'),
-                        'longitude': location_data.get('longitude')
-                    }
-
-                    # Ajouter code_station si disponible
-                    if i < len(locations) and 'code_station' in locations[i]:
-                        df_data['code_station'] = locations[i]['code_station']
-
-                    # Ajouter variables
-                    for var_key, api_var in zip(variables, api_variables):
-                        if api_var in location_data['daily']:
-                            df_data[var_key] = location_data['daily'][api_var]
-
-                    all_dfs.append(pd.DataFrame(df_data))
-
-                if not all_dfs:
-                    return pd.DataFrame()
+            # et un objet unique pour une seule location : même traitement dans les deux cas
+            if not isinstance(data, list):
+                data = [data]
 
-                result = pd.concat(all_dfs, ignore_index=True)
-                logger.debug(f"Retrieved {len(result)} weather records for {len(all_dfs)} locations")
-                return result
+            for i, location_data in zip(to_fetch, data):
+                payloads[i] = location_data
+                daily = location_data.get('daily')
+                if cache_keys[i] and daily and 'time' in daily:
+                    self.cache.set(cache_keys[i], location_data)
 
-            else:
-                # Mode single location (fallback)
-                if 'daily' not in data or 'time' not in data['daily']:
-                    logger.error("Malformed API response")
-                    return pd.DataFrame()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request error for batch: {e}")
+
+        except (KeyError, ValueError, AttributeError) as e:
+            logger.error(f"Error parsing batch weather data: {e}")
+
+    def _append_locations(
+        self,
+        locations: List[Dict[str, float]],
+        payloads: List[Optional[Dict]],
+        variables: Dict[str, str],
+        columns: Dict[str, list]
+    ) -> int:
+        """
+        Ajoute les réponses par location à l'accumulateur colonne par colonne.
 
-                time_data = pd.to_datetime(data['daily']['time'])
-                df_data = {
-                    'date': time_data.date if hasattr(time_data, 'date') else [d.date() for d in time_data]
-                }
+        Args:
+            locations: Locations demandées (même ordre que payloads)
+            payloads: Réponse API de chaque location (None si non reçue)
+            variables: Variables résolues {nom simplifié: nom API}
+            columns: Accumulateur {colonne: liste de valeurs}, complété en place
+                (colonne '_point' optionnelle : index de point de chaque location)
 
-                # Ajouter première location
-                if locations:
-                    df_data['latitude'] = locations[0]['latitude']
-                    df_data['longitude'] = locations[0]['longitude']
-                    if 'code_station' in locations[0]:
-                        df_data['code_station'] = locations[0]['code_station']
+        Returns:
+            Nombre d'enregistrements ajoutés
+        """
+        # Parser toutes les locations avant de toucher à l'accumulateur, pour ne
+        # jamais laisser de colonnes de longueurs différentes en cas d'erreur
+        parsed = []
+        for i, location_data in enumerate(payloads):
+            if location_data is None:
+                # Jamais reçue : l'erreur de la requête batch est déjà journalisée
+                continue
+            daily = location_data.get('daily') if isinstance(location_data, dict) else None
+            if not daily or 'time' not in daily:
+                logger.warning(f"Location {i}: Malformed response, skipping")
+                continue
 
-                # Ajouter variables
-                for var_key, api_var in zip(variables, api_variables):
-                    if api_var in data['daily']:
-                        df_data[var_key] = data['daily'][api_var]
+            n_days = len(daily['time'])
+            parsed.append((location_data, daily, n_days, locations[i]))
 
-                return pd.DataFrame(df_data)
+        track_points = '_point' in columns
+        n_records = 0
+        for location_data, daily, n_days, loc in parsed:
+            columns['date'].extend(daily['time'])
+            columns['latitude'].extend([location_data.get('latitude')] * n_days)
+            columns['longitude'].extend([location_data.get('longitude')] * n_days)
+            columns['code_station'].extend([loc.get('code_station')] * n_days)
+            if track_points:
+                columns['_point'].extend([loc['_point']] * n_days)
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request error for batch: {e}")
-            return pd.DataFrame()
+            # Ajouter variables (None si absente pour cette location)
+            for var_key, api_var in variables.items():
+                columns[var_key].extend(daily.get(api_var) or [None] * n_days)
 
-        except (KeyError, ValueError) as e:
-            logger.error(f"Error parsing batch weather data: {e}")
-            return pd.DataFrame()
+            n_records += n_days
+
+        logger.debug("Retrieved %d weather records for %d locations", n_records, len(parsed))
+        return n_records
 
     def get_weather_batch(
         self,
@@ -441,7 +618,8 @@ class OpenMeteoClient:
         date_fin: datetime,
         variables: List[str] = None,
         chunk_years: int = 3,
-        max_locations_per_request: int = 2
+        max_locations_per_request: Optional[int] = None,
+        grid_resolution: Optional[float] = None
     ) -> pd.DataFrame:
         """
         Récupère données météo pour plusieurs localisations de manière optimisée.
@@ -455,7 +633,13 @@ class OpenMeteoClient:
             date_fin: Date de fin
             variables: Variables météo à récupérer
             chunk_years: Nombre d'années par chunk temporel (défaut: 3)
-            max_locations_per_request: Nombre max de locations par requête (défaut: 2)
+            max_locations_per_request: Nombre max de locations par requête
+                (None = déduit du poids API de chaque chunk, voir MAX_REQUEST_WEIGHT)
+            grid_resolution: Pas de grille (degrés) pour regrouper les stations proches
+                en une seule requête, ex: 0.1 (~ maille du modèle). None = seules les
+                coordonnées identiques sont regroupées. Open-Meteo corrigeant certaines
+                variables (température) selon l'altitude du point exact, le regroupement
+                approxime légèrement les valeurs.
 
         Returns:
             DataFrame avec toutes les données météo
@@ -464,46 +648,48 @@ class OpenMeteoClient:
             logger.warning("get_weather_batch called with empty locations list")
             return pd.DataFrame()
 
-        # Variables par défaut
-        if variables is None:
-            variables = ["precipitation", "temperature", "evapotranspiration"]
-
-        # Validation variables
-        invalid_vars = [v for v in variables if v not in self.AVAILABLE_VARIABLES]
-        if invalid_vars:
-            logger.warning(f"Variables non reconnues (ignorées): {invalid_vars}")
-            variables = [v for v in variables if v in self.AVAILABLE_VARIABLES]
-
+        variables = self._resolve_variables(variables)
         if not variables:
             logger.warning("No valid variables specified")
             return pd.DataFrame()
 
-        # Valider et filtrer les locations
-        valid_locations = []
-        for idx, loc in enumerate(locations):
-            if 'latitude' not in loc or 'longitude' not in loc:
-                logger.warning(f"Location {idx}: Missing coordinates, skipping")
-                continue
-
-            try:
-                lat = float(loc['latitude'])
-                lon = float(loc['longitude'])
-                if self._validate_coordinates(lat, lon):
-                    valid_locations.append({
-                        'latitude': lat,
-                        'longitude': lon,
-                        'code_station': loc.get('code_station', f'loc_{idx}')
-                    })
-            except (ValueError, TypeError):
-                logger.warning(f"Location {idx}: Invalid coordinate values, skipping")
-                continue
+        # Valider et filtrer les locations (une passe vectorisée pour tout le batch)
+        valid = self._validate_batch(locations)
+        lats, lons = valid['latitude'], valid['longitude']
+        valid_locations = [
+            {
+                'latitude': float(lats[idx]),
+                'longitude': float(lons[idx]),
+                'code_station': locations[idx].get('code_station', f'loc_{idx}')
+            }
+            for idx in np.flatnonzero(valid['mask'])
+        ]
 
         if not valid_locations:
             logger.error("No valid locations found")
             return pd.DataFrame()
 
+        # Dédoublonner les stations aux coordonnées identiques (ou dans la même maille si
+        # grid_resolution) : une seule requête par point, faite aux coordonnées de la
+        # première station, puis données dupliquées vers chaque station du groupe
+        stations_by_point = {}  # clé point -> codes des stations du point
+        unique_locations = []  # une location par point, avec son index '_point'
+        for loc in valid_locations:
+            if grid_resolution:
+                key = (
+                    round(loc['latitude'] / grid_resolution),
+                    round(loc['longitude'] / grid_resolution)
+                )
+            else:
+                key = (loc['latitude'], loc['longitude'])
+            if key not in stations_by_point:
+                stations_by_point[key] = []
+                unique_locations.append({**loc, '_point': len(unique_locations)})
+            stations_by_point[key].append(loc['code_station'])
+
         logger.info(
             f"Fetching weather data for {len(valid_locations)} valid locations "
+            f"({len(unique_locations)} unique points) "
             f"from {date_debut.date()} to {date_fin.date()}"
         )
 
@@ -511,10 +697,16 @@ class OpenMeteoClient:
         years_span = (date_fin - date_debut).days / 365.25
         date_chunks = self._split_date_range(date_debut, date_fin, chunk_years) if years_span > chunk_years else [(date_debut, date_fin)]
 
-        # Diviser locations en batches
+        # Diviser locations en batches (taille adaptée au poids API si non imposée)
+        if max_locations_per_request is None:
+            longest_chunk_days = max((end - start).days + 1 for start, end in date_chunks)
+            max_locations_per_request = self._locations_per_request(
+                longest_chunk_days, len(variables)
+            )
+
         location_batches = [
-            valid_locations[i:i + max_locations_per_request]
-            for i in range(0, len(valid_locations), max_locations_per_request)
+            unique_locations[i:i + max_locations_per_request]
+            for i in range(0, len(unique_locations), max_locations_per_request)
         ]
 
         logger.info(
@@ -522,33 +714,58 @@ class OpenMeteoClient:
             f"= {len(date_chunks) * len(location_batches)} total API requests"
         )
 
-        all_data = []
+        # Accumulateur colonne par colonne : un seul DataFrame construit à la fin
+        # (pas de DataFrame par requête ni de pd.concat final)
+        columns = {'date': [], 'latitude': [], 'longitude': [], 'code_station': [], '_point': []}
+        columns.update({var_key: [] for var_key in variables})
+        total_records = 0
         total_requests = len(date_chunks) * len(location_batches)
         completed_requests = 0
 
         for date_start, date_end in date_chunks:
             for loc_batch in location_batches:
-                df_chunk = self._fetch_multi_location_chunk(
+                total_records += self._fetch_multi_location_chunk(
                     loc_batch,
                     date_start,
                     date_end,
-                    variables
+                    variables,
+                    columns
                 )
 
-                if not df_chunk.empty:
-                    all_data.append(df_chunk)
-
                 completed_requests += 1
                 if completed_requests % 5 == 0 or completed_requests == total_requests:
                     logger.info(
                         f"Progress: {completed_requests}/{total_requests} requests completed"
                     )
 
-        if not all_data:
+        if not total_records:
             logger.warning("No weather data retrieved for any location")
             return pd.DataFrame()
 
-        result = pd.concat(all_data, ignore_index=True)
+        # Un seul parsing des dates pour toutes les requêtes (datetime64, minuit)
+        columns['date'] = pd.to_datetime(columns['date'], format='%Y-%m-%d', cache=True)
+        result = pd.DataFrame(columns)
+        output_columns = [col for col in columns if col != '_point']
+
+        # Répartir les données de chaque point vers toutes les stations qui le partagent
+        # (jointure sur l'index de point : un même code_station peut figurer à plusieurs points)
+        if len(unique_locations) < len(valid_locations):
+            fanout = pd.DataFrame(
+                [
+                    (point, code_station)
+                    for point, codes in enumerate(stations_by_point.values())
+                    for code_station in codes
+                ],
+                columns=['_point', 'code_station']
+            )
+            result = (
+                result.drop(columns='code_station')
+                .merge(fanout, on='_point', how='inner', sort=False)
+                [output_columns]
+            )
+        else:
+            result = result[output_columns]
+
         logger.info(
             f"Successfully retrieved weather data: {len(result)} total records "
             f"from {len(valid_locations)} locations"
@@ -6,9 +6,19 @@ Refondue pour une meilleure gestion d'état et modularité.
 
 import streamlit as st
 import pandas as pd
+import atexit
 from datetime import datetime, timedelta
+from pathlib import Path
+import collections
+import copy
+import csv
+import io
 import logging
+import logging.handlers
+import queue
+import re
 import time
+from types import MappingProxyType
 
 from piezo_dataset_builder.core.validator import extract_station_codes, validate_station_codes
 from piezo_dataset_builder.core.dataset_builder import DatasetBuilder
@@ -18,14 +28,36 @@ from piezo_dataset_builder.utils.export import to_csv, to_excel, to_json, get_ex
 # LOGGING CONFIGURATION
 # ============================================================
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('piezo_dataset_builder.log')
-    ]
-)
+@st.cache_resource(show_spinner=False)
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Configure le logging une seule fois par processus (et non à chaque rerun).
+
+    Sans spinner : appelée avant st.set_page_config, qui doit rester la première
+    commande Streamlit (le spinner d'un cache miss émettrait un élément avant elle).
+
+    Les sorties console et fichier sont déportées dans un thread (QueueHandler +
+    QueueListener) : les appels de log ne font qu'enfiler l'enregistrement.
+    """
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    log_queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    file_handler = logging.FileHandler('piezo_dataset_builder.log')
+    for handler in (stream_handler, file_handler):
+        handler.setFormatter(formatter)
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, file_handler)
+    listener.start()
+    # Vide la file et ferme le fichier à l'arrêt du processus
+    atexit.register(listener.stop)
+
+    # Le formatage complet est fait par les handlers du listener : le QueueHandler ne
+    # garde que le message (sinon l'en-tête serait dupliqué)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+    return listener
+
+setup_logging()
 
 logger = logging.getLogger(__name__)
 
@@ -70,10 +102,179 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# ============================================================
+# SHARED RESOURCES
+# ============================================================
+
+# Cache disque des réponses API (attributs stations, météo historique), partagé entre
+# générations et redémarrages de l'application
+CACHE_DIR = Path.home() / '.cache' / 'piezo_dataset_builder'
+
+
+@st.cache_resource
+def get_builder(timeout: int, rate_limit_hubeau: float, rate_limit_meteo: float) -> DatasetBuilder:
+    """
+    Builder partagé entre reruns et sessions pour une configuration donnée.
+
+    Les sessions HTTP (pool keep-alive, retry) des clients sont ainsi réutilisées
+    au lieu d'être recréées à chaque génération. Les réponses API sont mises en cache
+    dans CACHE_DIR (désactivé si le répertoire ne peut pas être créé).
+    """
+    cache_dir = CACHE_DIR
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logger.warning(f"API cache disabled, cannot create '{cache_dir}': {e}")
+        cache_dir = None
+
+    return DatasetBuilder(
+        timeout=timeout,
+        rate_limit_hubeau=rate_limit_hubeau,
+        rate_limit_meteo=rate_limit_meteo,
+        cache_dir=str(cache_dir) if cache_dir else None
+    )
+
+
+# Lignes lues pour détecter séparateur, colonnes et aperçu (le fichier complet n'est
+# relu que pour la colonne des codes BSS)
+CSV_SAMPLE_ROWS = 100
+CSV_SNIFF_BYTES = 8192
+
+# Suggestion de la colonne des codes BSS (code_bss, bss_id, bss, code...)
+BSS_COLUMN_PATTERN = re.compile(r'code_bss|bss_id|bss|code', re.IGNORECASE)
+
+# Logs en temps réel : lignes affichées et intervalle min entre deux rendus (secondes)
+LOG_TAIL_LINES = 20
+LOG_RENDER_INTERVAL = 0.1
+
+
+@st.cache_data(show_spinner=False)
+def parse_uploaded_csv(file_bytes: bytes) -> tuple:
+    """
+    Lit un échantillon du CSV uploadé et détecte le séparateur.
+
+    Mis en cache sur le contenu du fichier : les reruns Streamlit (clics, widgets)
+    ne relisent pas le CSV.
+
+    Returns:
+        Tuple (échantillon DataFrame, séparateur)
+    """
+    # Cas courant : l'en-tête ne contient qu'un seul des séparateurs candidats,
+    # décidé sur la première ligne brute sans analyse de l'échantillon
+    line_end = file_bytes.find(b'\n')
+    first_line = file_bytes[:line_end] if line_end != -1 else file_bytes
+    candidates = [d for d in (',', ';', '\t', '|') if d.encode() in first_line]
+
+    if len(candidates) == 1:
+        sep = candidates[0]
+    elif not candidates:
+        # Fichier mono-colonne (aucun séparateur dans l'en-tête)
+        sep = ','
+    else:
+        # Ambigu : détection du séparateur sur les premiers Ko
+        sample = file_bytes[:CSV_SNIFF_BYTES].decode('utf-8', errors='replace')
+        try:
+            sep = csv.Sniffer().sniff(sample, delimiters=',;\t|').delimiter
+        except csv.Error:
+            sep = ','
+
+    # Une seule lecture avec le séparateur retenu
+    df_sample = pd.read_csv(io.BytesIO(file_bytes), sep=sep, nrows=CSV_SAMPLE_ROWS)
+    return df_sample, sep
+
+
+@st.cache_data(show_spinner=False)
+def read_csv_column(file_bytes: bytes, sep: str, column: str) -> pd.DataFrame:
+    """
+    Lit une seule colonne du CSV complet (moteur pyarrow multi-thread si possible).
+
+    Le coût de lecture suit une colonne et non la largeur du fichier.
+    """
+    try:
+        return pd.read_csv(io.BytesIO(file_bytes), sep=sep, usecols=[column], engine='pyarrow')
+    except Exception as e:
+        logger.debug(f"pyarrow CSV engine unavailable ({e}), falling back to C engine")
+        return pd.read_csv(io.BytesIO(file_bytes), sep=sep, usecols=[column])
+
+
+class _UncachedValidation(Exception):
+    """Résultat de validation à ne pas mettre en cache (levé hors de st.cache_data)."""
+
+    def __init__(self, result):
+        super().__init__()
+        self.result = result
+
+
+@st.cache_data(show_spinner=False, ttl=600)
+def _validate_codes_cached(codes_bss: tuple, sample_size: int):
+    valid, invalid = validate_station_codes(list(codes_bss), sample_size=sample_size)
+    if not valid:
+        # Aucun code trouvé : probable échec API (validate_station_codes absorbe les
+        # erreurs). Une exception empêche st.cache_data de mémoriser ce résultat.
+        raise _UncachedValidation((valid, invalid))
+    return valid, invalid
+
+
+def validate_codes_cached(codes_bss: tuple, sample_size: int = 5):
+    """
+    Validation Hub'Eau mise en cache par liste de codes (pas d'appel API par rerun).
+
+    Seules les validations ayant trouvé au moins un code sont mises en cache : après
+    une panne transitoire, le rerun suivant interroge de nouveau l'API.
+    """
+    try:
+        return _validate_codes_cached(codes_bss, sample_size)
+    except _UncachedValidation as e:
+        return e.result
+
 # ============================================================
 # STATE MANAGEMENT
 # ============================================================
 
+# Clés de config['meteo_vars'] -> noms de variables attendus par DatasetBuilder
+_METEO_MAPPING = MappingProxyType({
+    'precip': 'precipitation', 'temp': 'temperature', 'et': 'evapotranspiration',
+    'temp_min': 'temperature_min', 'temp_max': 'temperature_max',
+    'humidity': 'humidity', 'wind': 'wind', 'radiation': 'radiation'
+})
+
+# Pas de grille (degrés, ~ maille du modèle) du regroupement optionnel des stations
+# proches en une seule requête météo
+METEO_GRID_RESOLUTION = 0.1
+
+# Configuration par défaut (hors dates, calculées à l'initialisation). Gabarit en
+# lecture seule : init() en fait une copie profonde.
+_DEFAULT_CONFIG = {
+    'include_stations': True,
+    'include_chroniques': True,
+    'include_meteo': True,
+    'station_fields': {
+        'libelle_station': True,
+        'nom_commune': True,
+        'nom_departement': True
+    },
+    'chronique_fields': {
+        'niveau_nappe_ngf': True,
+        'profondeur_nappe': True
+    },
+    'meteo_vars': {
+        'precip': True,
+        'temp': True,
+        'et': True,
+        'temp_min': False,
+        'temp_max': False,
+        'humidity': False,
+        'wind': False,
+        'radiation': False
+    },
+    'meteo_grid_grouping': False,
+    'daily_aggregation': True,
+    'timeout': 30,
+    'rate_limit_hubeau': 0.1,
+    'rate_limit_meteo': 10.0
+}
+
+
 class AppState:
     """Gère l'état global de l'application."""
     
@@ -82,47 +283,27 @@ class AppState:
     STEP_BUILD = 3  # Transient step, usually skips quickly to RESULT if successful
     STEP_RESULT = 4
 
+    @staticmethod
+    def _new_state(config):
+        """État initial des données (étape 1, aucun résultat) avec la config donnée."""
+        return {
+            'current_step': AppState.STEP_UPLOAD,
+            'codes_bss': [],
+            'valid_codes': [],
+            'invalid_codes': [],
+            'df_result': None,
+            'exports': {},  # Sérialisations de df_result, calculées à la demande
+            'build_logs': [],
+            'config': config
+        }
+
     @staticmethod
     def init():
         if 'app_state' not in st.session_state:
-            st.session_state.app_state = {
-                'current_step': AppState.STEP_UPLOAD,
-                'codes_bss': [],
-                'valid_codes': [],
-                'invalid_codes': [],
-                'df_result': None,
-                'build_logs': [],
-                'config': {
-                    'date_start': datetime.now() - timedelta(days=30),
-                    'date_end': datetime.now(),
-                    'include_stations': True,
-                    'include_chroniques': True,
-                    'include_meteo': True,
-                    'station_fields': {
-                        'libelle_station': True,
-                        'nom_commune': True,
-                        'nom_departement': True
-                    },
-                    'chronique_fields': {
-                        'niveau_nappe_ngf': True,
-                        'profondeur_nappe': True
-                    },
-                    'meteo_vars': {
-                        'precip': True,
-                        'temp': True,
-                        'et': True,
-                        'temp_min': False,
-                        'temp_max': False,
-                        'humidity': False,
-                        'wind': False,
-                        'radiation': False
-                    },
-                    'daily_aggregation': True,
-                    'timeout': 30,
-                    'rate_limit_hubeau': 0.1,
-                    'rate_limit_meteo': 10.0
-                }
-            }
+            config = copy.deepcopy(_DEFAULT_CONFIG)
+            config['date_end'] = datetime.now()
+            config['date_start'] = config['date_end'] - timedelta(days=30)
+            st.session_state.app_state = AppState._new_state(config)
 
     @staticmethod
     def get(key):
@@ -133,35 +314,45 @@ class AppState:
         st.session_state.app_state[key] = value
 
     @staticmethod
-    def update_config(key, value):
-        st.session_state.app_state['config'][key] = value
+    def get_export(key, converter):
+        """
+        Sérialisation de df_result mémorisée entre reruns (calculée au premier accès).
+
+        Args:
+            key: Nom de l'export ('csv', 'excel', 'json', 'stats')
+            converter: Fonction df -> export
+        """
+        exports = st.session_state.app_state['exports']
+        if key not in exports:
+            exports[key] = converter(st.session_state.app_state['df_result'])
+        return exports[key]
 
     @staticmethod
-    def update_meteo_var(var, value):
-        st.session_state.app_state['config']['meteo_vars'][var] = value
-        
+    def update_config_bulk(values):
+        st.session_state.app_state['config'].update(values)
+
+    @staticmethod
+    def update_meteo_vars_bulk(values):
+        st.session_state.app_state['config']['meteo_vars'].update(values)
+
     @staticmethod
-    def update_station_field(field, value):
-        st.session_state.app_state['config']['station_fields'][field] = value
+    def update_station_fields_bulk(values):
+        st.session_state.app_state['config']['station_fields'].update(values)
 
     @staticmethod
-    def update_chronique_field(field, value):
-        st.session_state.app_state['config']['chronique_fields'][field] = value
+    def update_chronique_fields_bulk(values):
+        st.session_state.app_state['config']['chronique_fields'].update(values)
 
     @staticmethod
     def set_step(step):
+        # Pas de st.rerun() ici : appelé depuis un callback on_click, Streamlit relance
+        # déjà le script ; les appelants en milieu de script relancent explicitement.
         st.session_state.app_state['current_step'] = step
-        # Force rerun to update UI immediately
-        st.rerun()
 
     @staticmethod
     def reset():
         # Keep config but reset data
-        config = st.session_state.app_state['config']
-        del st.session_state.app_state
-        AppState.init()
-        st.session_state.app_state['config'] = config
-        st.rerun()
+        st.session_state.app_state = AppState._new_state(st.session_state.app_state['config'])
 
 # Initialize state
 AppState.init()
@@ -170,6 +361,11 @@ AppState.init()
 # UI COMPONENTS
 # ============================================================
 
+def go_to_config(codes_bss):
+    """Callback du bouton de l'étape 1 : mémorise les codes et passe à la configuration."""
+    AppState.set('codes_bss', codes_bss)
+    AppState.set_step(AppState.STEP_CONFIG)
+
 def render_sidebar():
     with st.sidebar:
         st.title("💧 Navigation")
@@ -186,8 +382,7 @@ def render_sidebar():
         st.markdown("---")
         
         if step > 1:
-            if st.button("🔄 Recommencer", use_container_width=True):
-                AppState.reset()
+            st.button("🔄 Recommencer", use_container_width=True, on_click=AppState.reset)
         
         st.markdown("---")
         st.caption("Documentation")
@@ -242,38 +437,25 @@ def render_step_1_upload():
             
         if uploaded_file is not None:
             try:
-                # Tentative de lecture auto-détectée, sinon essai avec ;
-                try:
-                    df_input = pd.read_csv(uploaded_file)
-                    # Si on a qu'une seule colonne et qu'elle contient des ; ou , dans les valeurs, c'est suspect
-                    if len(df_input.columns) == 1 and df_input.iloc[0].astype(str).str.contains(';|,').any():
-                         uploaded_file.seek(0)
-                         df_input = pd.read_csv(uploaded_file, sep=';')
-                except:
-                     uploaded_file.seek(0)
-                     df_input = pd.read_csv(uploaded_file, sep=';')
+                file_bytes = uploaded_file.getvalue()
+                df_input, sep = parse_uploaded_csv(file_bytes)
 
                 # Si plusieurs colonnes, afficher sélecteur
                 selected_column = None
                 if len(df_input.columns) > 1:
                     st.info(f"📋 Le fichier contient {len(df_input.columns)} colonnes. Sélectionnez celle contenant les codes BSS.")
 
-                    # Suggestion automatique basée sur les patterns
-                    suggested_col = None
-                    for col in df_input.columns:
-                        col_lower = col.lower()
-                        if any(pattern in col_lower for pattern in ['code_bss', 'bss_id', 'bss', 'code']):
-                            suggested_col = col
-                            break
-
-                    # Index de la colonne suggérée
-                    default_index = 0
-                    if suggested_col:
-                        default_index = list(df_input.columns).index(suggested_col)
+                    # Suggestion automatique basée sur les patterns (index de la 1re colonne
+                    # correspondante, sinon la première)
+                    columns = df_input.columns.tolist()
+                    default_index = next(
+                        (i for i, col in enumerate(columns) if BSS_COLUMN_PATTERN.search(str(col))),
+                        0
+                    )
 
                     selected_column = st.selectbox(
                         "Colonne contenant les codes BSS:",
-                        options=df_input.columns.tolist(),
+                        options=columns,
                         index=default_index,
                         help="Sélectionnez la colonne qui contient les codes de stations piézométriques (BSS)"
                     )
@@ -283,7 +465,9 @@ def render_step_1_upload():
                 else:
                     st.info(f"📋 Une seule colonne détectée: '{df_input.columns[0]}' - Utilisation automatique")
 
-                codes_bss = extract_station_codes(df_input, column_name=selected_column)
+                # Lecture complète limitée à la colonne des codes
+                df_codes = read_csv_column(file_bytes, sep, selected_column or df_input.columns[0])
+                codes_bss = extract_station_codes(df_codes, column_name=selected_column)
 
                 if not codes_bss:
                     st.error("❌ Aucun code BSS valide trouvé dans la colonne sélectionnée.")
@@ -294,7 +478,7 @@ def render_step_1_upload():
                 # Validation optionnelle mais recommandée
                 with st.expander("🔍 Validation des codes (Échantillon)", expanded=True):
                     with st.spinner("Validation rapide via Hub'Eau..."):
-                        valid, invalid = validate_station_codes(codes_bss, sample_size=5)
+                        valid, invalid = validate_codes_cached(tuple(codes_bss), sample_size=5)
                     
                     col_v1, col_v2 = st.columns(2)
                     with col_v1:
@@ -305,9 +489,10 @@ def render_step_1_upload():
                     if invalid:
                         st.warning(f"Certains codes semblent invalides (ex: {invalid[0]}). Ils seront ignorés lors de la construction.")
                 
-                if st.button("Passer à la configuration ➡️", type="primary"):
-                    AppState.set('codes_bss', codes_bss)
-                    AppState.set_step(AppState.STEP_CONFIG)
+                st.button(
+                    "Passer à la configuration ➡️", type="primary",
+                    on_click=go_to_config, args=(codes_bss,)
+                )
                     
             except Exception as e:
                 st.error(f"Erreur lors de la lecture du fichier : {e}")
@@ -407,6 +592,7 @@ def render_step_2_config():
         vhum = meteo_vars['humidity']
         vwind = meteo_vars['wind']
         vrad = meteo_vars['radiation']
+        mgrid = config['meteo_grid_grouping']
 
         if inc_meteo:
             with col_m_opts:
@@ -424,6 +610,12 @@ def render_step_2_config():
                     with c4:
                         vwind = st.checkbox("Vent", value=meteo_vars['wind'])
                         vrad = st.checkbox("Rayonnement", value=meteo_vars['radiation'])
+                    mgrid = st.checkbox(
+                        f"Regrouper les stations proches (maille ~{METEO_GRID_RESOLUTION}°)",
+                        value=config['meteo_grid_grouping'],
+                        help="Une seule requête météo par maille : moins d'appels API, "
+                             "valeurs légèrement approchées (correction d'altitude)."
+                    )
         
         st.markdown("---")
 
@@ -448,46 +640,45 @@ def render_step_2_config():
                 return
                 
             # Mise à jour du state
-            AppState.update_config('date_start', d_start)
-            AppState.update_config('date_end', d_end)
-            AppState.update_config('include_stations', inc_stations)
-            AppState.update_config('include_chroniques', inc_chroniques)
-            AppState.update_config('include_meteo', inc_meteo)
-            AppState.update_config('daily_aggregation', daily)
-            AppState.update_config('timeout', timeout)
-            AppState.update_config('rate_limit_hubeau', rl_h)
-            AppState.update_config('rate_limit_meteo', rl_m)
+            AppState.update_config_bulk({
+                'date_start': d_start,
+                'date_end': d_end,
+                'include_stations': inc_stations,
+                'include_chroniques': inc_chroniques,
+                'include_meteo': inc_meteo,
+                'meteo_grid_grouping': mgrid,
+                'daily_aggregation': daily,
+                'timeout': timeout,
+                'rate_limit_hubeau': rl_h,
+                'rate_limit_meteo': rl_m
+            })
             
             # Update meteo vars
             if inc_meteo:
-                new_vars = {
+                AppState.update_meteo_vars_bulk({
                     'precip': vp, 'temp': vt, 'et': vet, 'temp_min': vtmin,
                     'temp_max': vtmax, 'humidity': vhum, 'wind': vwind, 'radiation': vrad
-                }
-                for k, v in new_vars.items():
-                    AppState.update_meteo_var(k, v)
+                })
             
             # Update station fields
             if inc_stations:
-                new_s_fields = {
+                AppState.update_station_fields_bulk({
                     'libelle_station': sf_lib,
                     'nom_commune': sf_com,
                     'nom_departement': sf_dept
-                }
-                for k, v in new_s_fields.items():
-                    AppState.update_station_field(k, v)
+                })
 
             # Update chronique fields
             if inc_chroniques:
-                new_c_fields = {
+                AppState.update_chronique_fields_bulk({
                     'niveau_nappe_ngf': cf_ngf,
                     'profondeur_nappe': cf_prof
-                }
-                for k, v in new_c_fields.items():
-                    AppState.update_chronique_field(k, v)
+                })
 
-            # Transition vers l'étape de construction
+            # Transition vers l'étape de construction (valeurs du formulaire lues en
+            # cours de script : relance explicite)
             AppState.set_step(AppState.STEP_BUILD)
+            st.rerun()
             
 def run_build_process():
     st.header("3️⃣ Construction en cours...")
@@ -495,27 +686,16 @@ def run_build_process():
     config = AppState.get('config')
     codes = AppState.get('codes_bss')
     
-    # Préparer la liste des variables météo
-    meteo_vars_list = []
-    mvars = config['meteo_vars']
-    mapping = {
-        'precip': 'precipitation', 'temp': 'temperature', 'et': 'evapotranspiration',
-        'temp_min': 'temperature_min', 'temp_max': 'temperature_max',
-        'humidity': 'humidity', 'wind': 'wind', 'radiation': 'radiation'
-    }
-    for k, v in mvars.items():
-        if v: meteo_vars_list.append(mapping[k])
-    
-    # Préparer listes champs stations et chroniques
-    station_fields_list = []
-    if config['include_stations']:
-        for k, v in config['station_fields'].items():
-            if v: station_fields_list.append(k)
-            
-    chronique_fields_list = []
-    if config['include_chroniques']:
-        for k, v in config['chronique_fields'].items():
-            if v: chronique_fields_list.append(k)
+    # Préparer les listes de variables météo, champs stations et chroniques
+    meteo_vars_list = [_METEO_MAPPING[k] for k, v in config['meteo_vars'].items() if v]
+    station_fields_list = (
+        [k for k, v in config['station_fields'].items() if v]
+        if config['include_stations'] else []
+    )
+    chronique_fields_list = (
+        [k for k, v in config['chronique_fields'].items() if v]
+        if config['include_chroniques'] else []
+    )
     
     # UI de progression
     progress_bar = st.progress(0)
@@ -525,20 +705,29 @@ def run_build_process():
     with st.expander("📋 Logs en temps réel", expanded=True):
         log_area = st.empty()
 
-    logs = []
+    logs = []  # Historique complet, conservé pour l'étape résultat
+    recent = collections.deque(maxlen=LOG_TAIL_LINES)
+    last_render = 0.0
 
     def progress_callback(pct, msg):
+        nonlocal last_render
+        line = f"[{datetime.now().strftime('%H:%M:%S')}] {msg}"
+        logs.append(line)
+        recent.append(line)
+        # Rendu limité à un toutes les LOG_RENDER_INTERVAL secondes (et à 100 %)
+        now = time.monotonic()
+        if now - last_render < LOG_RENDER_INTERVAL and pct < 100:
+            return
+        last_render = now
         progress_bar.progress(pct / 100)
         status_text.markdown(f"**{msg}**")
-        logs.append(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}")
-        # Affiche tous les logs (limité aux 20 derniers pour la performance)
-        log_area.code("\n".join(logs[-20:]), language="log")
+        log_area.code("\n".join(recent), language="log")
         
     try:
-        builder = DatasetBuilder(
-            timeout=config['timeout'],
-            rate_limit_hubeau=config['rate_limit_hubeau'],
-            rate_limit_meteo=config['rate_limit_meteo']
+        builder = get_builder(
+            config['timeout'],
+            config['rate_limit_hubeau'],
+            config['rate_limit_meteo']
         )
         
         df = builder.build_dataset(
@@ -552,18 +741,29 @@ def run_build_process():
             station_fields=station_fields_list,
             chronique_fields=chronique_fields_list,
             daily_aggregation=config['daily_aggregation'],
-            progress_callback=progress_callback
+            progress_callback=progress_callback,
+            meteo_grid_resolution=METEO_GRID_RESOLUTION if config['meteo_grid_grouping'] else None
         )
         
         AppState.set('df_result', df)
+        AppState.set('exports', {})
         AppState.set('build_logs', logs)
         AppState.set_step(AppState.STEP_RESULT)
         
     except Exception as e:
+        # Derniers messages (souvent la cause de l'échec) éventuellement non rendus
+        # à cause du throttling : affichage forcé et conservation de l'historique
+        log_area.code("\n".join(recent), language="log")
+        AppState.set('build_logs', logs)
         st.error(f"Une erreur est survenue : {str(e)}")
         st.exception(e)
-        if st.button("Retour à la configuration"):
-            AppState.set_step(AppState.STEP_CONFIG)
+        st.button(
+            "Retour à la configuration",
+            on_click=AppState.set_step, args=(AppState.STEP_CONFIG,)
+        )
+    else:
+        # Hors du try : la relance ne doit pas être interceptée par le except
+        st.rerun()
 
 def render_step_4_result():
     st.header("4️⃣ Résultat")
@@ -573,8 +773,7 @@ def render_step_4_result():
 
     if df is None or df.empty:
         st.warning("Le dataset généré est vide.")
-        if st.button("Recommencer"):
-            AppState.set_step(AppState.STEP_CONFIG)
+        st.button("Recommencer", on_click=AppState.set_step, args=(AppState.STEP_CONFIG,))
         return
 
     st.markdown(f"""
@@ -595,7 +794,7 @@ def render_step_4_result():
         st.dataframe(df.head(100), use_container_width=True)
         
     with tab2:
-        stats = get_export_stats(df)
+        stats = AppState.get_export('stats', get_export_stats)
         c1, c2, c3, c4 = st.columns(4)
         c1.metric("Lignes", stats['nb_lignes'])
         c2.metric("Colonnes", stats['nb_colonnes'])
@@ -614,7 +813,7 @@ def render_step_4_result():
         with c1:
             st.download_button(
                 "📥 Télécharger CSV",
-                data=to_csv(df),
+                data=AppState.get_export('csv', to_csv),
                 file_name=f"{filename}.csv",
                 mime="text/csv",
                 use_container_width=True
@@ -623,7 +822,7 @@ def render_step_4_result():
         with c2:
             st.download_button(
                 "📥 Télécharger Excel",
-                data=to_excel(df),
+                data=AppState.get_export('excel', to_excel),
                 file_name=f"{filename}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 use_container_width=True
@@ -632,7 +831,7 @@ def render_step_4_result():
         with c3:
             st.download_button(
                 "📥 Télécharger JSON",
-                data=to_json(df),
+                data=AppState.get_export('json', to_json),
                 file_name=f"{filename}.json",
                 mime="application/json",
                 use_container_width=True
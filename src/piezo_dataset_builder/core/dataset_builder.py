@@ -7,8 +7,8 @@ Données intégrées:
 """
 
 import pandas as pd
-from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any, Callable
+from datetime import datetime
+from typing import List, Optional, Callable
 import logging
 
 from ..api.hubeau import HubEauClient
@@ -24,11 +24,21 @@ class DatasetBuilder:
     MAX_STATIONS = 500
     MAX_DAYS = 730  # 2 ans
 
+    # Mapping: noms utilisateur → noms réels API Hub'Eau (chroniques)
+    CHRONIQUE_FIELD_MAPPING = {
+        'niveau_nappe_ngf': 'niveau_nappe_eau',  # UI name → API name
+        'profondeur_nappe': 'profondeur_nappe',
+        'qualification': 'qualification',
+        'mode_obtention': 'mode_obtention',
+        'statut': 'statut'
+    }
+
     def __init__(
         self,
         timeout: int = 30,
         rate_limit_hubeau: float = 0.3,
-        rate_limit_meteo: float = 0.1
+        rate_limit_meteo: float = 0.1,
+        cache_dir: Optional[str] = None
     ):
         """
         Initialise le builder pour piézométrie.
@@ -37,14 +47,17 @@ class DatasetBuilder:
             timeout: Timeout pour les requêtes HTTP (secondes)
             rate_limit_hubeau: Rate limit pour Hub'Eau (secondes entre requêtes)
             rate_limit_meteo: Rate limit pour Open-Meteo (secondes entre requêtes)
+            cache_dir: Répertoire du cache disque des réponses API (None = désactivé)
         """
         self.hubeau_client = HubEauClient(
             timeout=timeout,
-            rate_limit=rate_limit_hubeau
+            rate_limit=rate_limit_hubeau,
+            cache_dir=cache_dir
         )
         self.meteo_client = OpenMeteoClient(
             timeout=timeout,
-            rate_limit=rate_limit_meteo
+            rate_limit=rate_limit_meteo,
+            cache_dir=cache_dir
         )
 
         logger.info(
@@ -65,7 +78,8 @@ class DatasetBuilder:
         station_fields: List[str] = None,
         chronique_fields: List[str] = None,
         daily_aggregation: bool = True,
-        progress_callback: Optional[Callable[[int, str], None]] = None
+        progress_callback: Optional[Callable[[int, str], None]] = None,
+        meteo_grid_resolution: Optional[float] = None
     ) -> pd.DataFrame:
         """
         Construit le dataset complet pour stations piézométriques.
@@ -82,6 +96,8 @@ class DatasetBuilder:
             chronique_fields: Liste des attributs chroniques à conserver (None = tous)
             daily_aggregation: Agréger les données au niveau journalier
             progress_callback: Optional callback(progress_pct, message) for progress updates
+            meteo_grid_resolution: Pas de grille (degrés) pour regrouper les stations
+                proches en une seule requête météo (None = coordonnées identiques seulement)
 
         Returns:
             DataFrame complet avec toutes les données
@@ -146,10 +162,20 @@ class DatasetBuilder:
         # 2. Récupérer chroniques de niveaux de nappe
         if include_chroniques:
             update_progress(30, "Fetching groundwater level chroniques...")
+
+            # Projection côté API : ne demander que les champs utiles à Hub'Eau
+            # (les réponses chroniques comportent une quinzaine de champs par mesure)
+            api_fields = None
+            if chronique_fields:
+                api_fields = ['code_bss', 'date_mesure'] + [
+                    self.CHRONIQUE_FIELD_MAPPING.get(f, f) for f in chronique_fields
+                ]
+
             df_chroniques = self._get_chroniques_data(
                 codes_bss,
                 date_start,
-                date_end
+                date_end,
+                fields=api_fields
             )
             
             # Filtrage des colonnes chroniques
@@ -157,14 +183,7 @@ class DatasetBuilder:
                 # Toujours garder code_bss et date
                 cols_to_keep = {'code_bss', 'date'}
 
-                # Mapping: noms utilisateur → noms réels API Hub'Eau
-                chronique_field_mapping = {
-                    'niveau_nappe_ngf': 'niveau_nappe_eau',  # UI name → API name
-                    'profondeur_nappe': 'profondeur_nappe',
-                    'qualification': 'qualification',
-                    'mode_obtention': 'mode_obtention',
-                    'statut': 'statut'
-                }
+                chronique_field_mapping = self.CHRONIQUE_FIELD_MAPPING
 
                 # Ajouter les noms réels API correspondant aux champs demandés
                 for user_field in chronique_fields:
@@ -173,14 +192,22 @@ class DatasetBuilder:
                         cols_to_keep.add(real_field)
 
                 actual_cols = [c for c in df_chroniques.columns if c in cols_to_keep]
+
+                # Sélection et renommage (mapping inverse pour l'export) en une passe :
+                # les noms sont posés directement sur la copie issue de la sélection,
+                # sans second DataFrame intermédiaire via rename()
+                inverse_mapping = {v: k for k, v in chronique_field_mapping.items()}
                 df_chroniques = df_chroniques[actual_cols]
+                df_chroniques.columns = [inverse_mapping.get(c, c) for c in actual_cols]
 
-                # Renommer les colonnes selon le mapping inverse pour l'export
-                inverse_mapping = {v: k for k, v in chronique_field_mapping.items() if v in df_chroniques.columns}
-                df_chroniques = df_chroniques.rename(columns=inverse_mapping)
-            
             update_progress(50, f"Retrieved {len(df_chroniques)} groundwater level records")
 
+            # Agrégation journalière AVANT les merges : les attributs stations et la météo
+            # sont déjà à une ligne par (station, jour), inutile de les dupliquer sur
+            # chaque mesure infra-journalière pour les ré-agréger ensuite
+            if daily_aggregation and not df_chroniques.empty:
+                df_chroniques = self._aggregate_daily(df_chroniques)
+
             if not df_chroniques.empty:
                 # Merger avec stations
                 df_base = df_chroniques.merge(
@@ -216,7 +243,9 @@ class DatasetBuilder:
                 df_base,
                 date_start,
                 date_end,
-                meteo_variables or ['precipitation', 'temperature', 'evapotranspiration']
+                meteo_variables or ['precipitation', 'temperature', 'evapotranspiration'],
+                df_stations=df_stations,
+                grid_resolution=meteo_grid_resolution
             )
             update_progress(80, "Weather data added")
         else:
@@ -224,45 +253,21 @@ class DatasetBuilder:
                 logger.warning("Cannot add weather data: no GPS coordinates available")
             update_progress(80, "Skipping weather data")
 
-        # 4. Agrégation journalière si demandée
-        if daily_aggregation and not df_base.empty:
-            update_progress(85, "Performing daily aggregation...")
-            df_base = self._aggregate_daily(df_base)
-
         # Tri final
         if not df_base.empty and 'date' in df_base.columns:
             df_base = df_base.sort_values(['code_bss', 'date'])
 
-        # 5. Nettoyage final : Supprimer UNIQUEMENT les colonnes qui n'ont pas été demandées
+            # La clé journalière interne est en datetime64 : retour à des dates
+            # calendaires (sans heure) uniquement pour le dataset final
+            if pd.api.types.is_datetime64_any_dtype(df_base['date']):
+                df_base['date'] = df_base['date'].dt.date
+
+        # 4. Nettoyage final : Supprimer UNIQUEMENT les colonnes qui n'ont pas été demandées
         # Attention : df_base a déjà été filtré lors des étapes précédentes (df_stations, df_chroniques)
         # MAIS le merge de la grille temporelle ou de la météo a pu réintroduire des colonnes (latitude, longitude...)
-        
-        # On reconstruit la liste de ce qu'on veut vraiment garder à la fin
-        desired_columns = {'code_bss', 'date'} # Toujours garder les clés
-        
-        # 1. Champs stations demandés
-        if include_stations and station_fields:
-            desired_columns.update(station_fields)
-        elif include_stations:
-            # Si pas de filtre spécifié, on garde toutes les colonnes initiales de df_stations (avant merge)
-            # C'est complexe à retrouver ici.
-            # Pour l'instant, on fait confiance au filtre appliqué à l'étape 1
-            # Si station_fields est None, on garde tout ce qui est là.
-            pass
-
-        # 2. Champs chroniques demandés
-        if include_chroniques and chronique_fields:
-             desired_columns.update(chronique_fields)
-        
-        # 3. Champs météo demandés
-        if include_meteo and meteo_variables:
-             desired_columns.update(meteo_variables)
-             
+
         # Si on a défini des filtres explicites, on nettoie le DF final
         if (station_fields or chronique_fields or meteo_variables):
-            # On ne garde que les colonnes présentes qui sont dans desired_columns
-            # SAUF si on est en mode "include_stations=True" sans "station_fields" (on garde tout)
-            
             # Logique "safe" : On supprime ce qu'on sait être en trop
             # Cas typique : latitude/longitude récupérés pour la météo mais pas cochés par l'user
             
@@ -340,11 +345,11 @@ class DatasetBuilder:
             logger.error("No 'code_bss' column in station data")
             return pd.DataFrame()
 
-        # Nettoyer coordonnées GPS
-        if 'latitude' in df.columns:
-            df['latitude'] = pd.to_numeric(df['latitude'], errors='coerce')
-        if 'longitude' in df.columns:
-            df['longitude'] = pd.to_numeric(df['longitude'], errors='coerce')
+        # Nettoyer coordonnées GPS (déjà numériques si extraites par HubEauClient :
+        # on évite alors une conversion qui réalloue la colonne pour rien)
+        for col in ('latitude', 'longitude'):
+            if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], errors='coerce')
 
         return df
 
@@ -352,25 +357,40 @@ class DatasetBuilder:
         self,
         codes_bss: List[str],
         date_start: datetime,
-        date_end: datetime
+        date_end: datetime,
+        fields: Optional[List[str]] = None
     ) -> pd.DataFrame:
         """Récupère chroniques de niveaux de nappe depuis Hub'Eau."""
-        df = self.hubeau_client.get_chroniques_batch(codes_bss, date_start, date_end)
+        df = self.hubeau_client.get_chroniques_batch(
+            codes_bss, date_start, date_end, fields=fields
+        )
 
         if df.empty:
             return pd.DataFrame()
 
-        # S'assurer qu'il y a une colonne date
-        if 'date' not in df.columns:
+        # S'assurer qu'il y a une colonne date (clé journalière datetime64)
+        if 'date' in df.columns:
+            df['date'] = self._to_day_key(df['date'])
+        else:
             # Chercher colonne date
             date_cols = [col for col in df.columns if 'date' in col.lower()]
             if date_cols:
                 # Prendre première colonne date et convertir
-                df['date'] = pd.to_datetime(df[date_cols[0]], errors='coerce').dt.date
+                df['date'] = self._to_day_key(df[date_cols[0]])
                 logger.debug(f"Created unified 'date' column from '{date_cols[0]}'")
 
         return df
 
+    @staticmethod
+    def _to_day_key(dates: pd.Series) -> pd.Series:
+        """
+        Convertit une colonne de dates en clé journalière datetime64 (minuit).
+
+        Les merges et groupby sur datetime64 s'appuient sur un hachage int64,
+        bien plus rapide que sur des objets ``datetime.date`` Python.
+        """
+        return pd.to_datetime(dates, errors='coerce').dt.normalize()
+
     def _create_date_station_grid(
         self,
         df_stations: pd.DataFrame,
@@ -385,12 +405,11 @@ class DatasetBuilder:
         """
         logger.debug("Creating optimized date×station grid")
 
-        # Générer range de dates
-        dates = pd.date_range(date_start, date_end, freq='D').date
+        # Générer range de dates (clé journalière datetime64, sans objets date Python)
+        dates = pd.date_range(date_start, date_end, freq='D').normalize()
 
-        # Extraire codes BSS uniques
-        df_stations_unique = df_stations.drop_duplicates(subset=['code_bss'])
-        codes_bss = df_stations_unique['code_bss'].values
+        # Extraire codes BSS uniques (ordre conservé, sans copie du DataFrame stations)
+        codes_bss = df_stations['code_bss'].unique()
 
         # Créer produit cartésien avec MultiIndex (beaucoup plus rapide)
         index = pd.MultiIndex.from_product(
@@ -416,9 +435,17 @@ class DatasetBuilder:
         df: pd.DataFrame,
         date_start: datetime,
         date_end: datetime,
-        variables: List[str]
+        variables: List[str],
+        df_stations: Optional[pd.DataFrame] = None,
+        grid_resolution: Optional[float] = None
     ) -> pd.DataFrame:
-        """Ajoute données météo (température AIR, précipitations, etc.) au DataFrame."""
+        """
+        Ajoute données météo (température AIR, précipitations, etc.) au DataFrame.
+
+        Si df_stations (une ligne par station) est fourni, les coordonnées en sont
+        extraites directement au lieu de dédupliquer le DataFrame complet
+        (stations × jours). grid_resolution est transmis à get_weather_batch.
+        """
         # Extraire stations uniques avec coordonnées
         stations_cols = ['code_bss', 'latitude', 'longitude']
         stations_cols = [c for c in stations_cols if c in df.columns]
@@ -427,7 +454,13 @@ class DatasetBuilder:
             logger.warning("GPS coordinates missing, cannot add weather data")
             return df
 
-        stations_unique = df[stations_cols].drop_duplicates()
+        if df_stations is not None and set(stations_cols).issubset(df_stations.columns):
+            # Ne garder que les stations effectivement présentes dans df
+            stations_unique = df_stations.loc[
+                df_stations['code_bss'].isin(df['code_bss'].unique()), stations_cols
+            ].drop_duplicates()
+        else:
+            stations_unique = df[stations_cols].drop_duplicates()
 
         # Filtrer stations avec coordonnées valides
         stations_valid = stations_unique[
@@ -444,21 +477,18 @@ class DatasetBuilder:
             f"with valid coordinates"
         )
 
-        # Préparer locations pour batch
-        locations = []
-        for _, row in stations_valid.iterrows():
-            locations.append({
-                'code_station': row['code_bss'],  # Pour meteo client
-                'latitude': row['latitude'],
-                'longitude': row['longitude']
-            })
+        # Préparer locations pour batch (conversion vectorisée, sans iterrows)
+        locations = stations_valid.rename(
+            columns={'code_bss': 'code_station'}  # Pour meteo client
+        ).to_dict('records')
 
         # Requête batch météo
         df_meteo = self.meteo_client.get_weather_batch(
             locations,
             date_start,
             date_end,
-            variables
+            variables,
+            grid_resolution=grid_resolution
         )
 
         if df_meteo.empty:
@@ -472,11 +502,11 @@ class DatasetBuilder:
         # Joindre avec données principales
         merge_cols = ['code_bss', 'date']
 
-        # S'assurer que les types correspondent
+        # S'assurer que les types correspondent (clé journalière datetime64)
         if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'], errors='coerce').dt.date
+            df['date'] = self._to_day_key(df['date'])
         if 'date' in df_meteo.columns:
-            df_meteo['date'] = pd.to_datetime(df_meteo['date'], errors='coerce').dt.date
+            df_meteo['date'] = self._to_day_key(df_meteo['date'])
 
         # Merge en évitant les doublons de latitude/longitude
         df = df.merge(
@@ -498,17 +528,19 @@ class DatasetBuilder:
             logger.warning("No 'date' column found, skipping aggregation")
             return df
 
-        # Colonnes de groupement
+        # Colonnes de groupement : (station, jour) uniquement
         group_cols = ['code_bss', 'date']
 
-        # Ajouter colonnes non-numériques importantes (si elles existent)
-        for col in ['latitude', 'longitude', 'nom_commune', 'libelle_commune']:
-            if col in df.columns and col not in group_cols:
-                group_cols.append(col)
+        # Attributs constants par station : inutile de les hacher comme clés de
+        # groupement, on reprend simplement leur première valeur
+        station_cols = [
+            col for col in ['latitude', 'longitude', 'nom_commune', 'libelle_commune']
+            if col in df.columns
+        ]
 
         # Colonnes numériques à moyenner
         numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-        numeric_cols = [c for c in numeric_cols if c not in group_cols]
+        numeric_cols = [c for c in numeric_cols if c not in group_cols and c not in station_cols]
 
         if not numeric_cols:
             # Pas de colonnes numériques à agréger, juste dédupliquer
@@ -516,11 +548,12 @@ class DatasetBuilder:
             return df.drop_duplicates(subset=group_cols)
 
         # Agrégation
-        agg_dict = {col: 'mean' for col in numeric_cols}
+        agg_dict = {col: 'first' for col in station_cols}
+        agg_dict.update({col: 'mean' for col in numeric_cols})
 
         # Garder première valeur pour colonnes texte
         text_cols = df.select_dtypes(include=['object']).columns.tolist()
-        text_cols = [c for c in text_cols if c not in group_cols]
+        text_cols = [c for c in text_cols if c not in group_cols and c not in station_cols]
         for col in text_cols:
             agg_dict[col] = 'first'
 
@@ -529,7 +562,8 @@ class DatasetBuilder:
             f"and {len(text_cols)} text columns"
         )
 
-        df_agg = df.groupby(group_cols, as_index=False).agg(agg_dict)
+        # sort=False : le tri final est fait une seule fois dans build_dataset
+        df_agg = df.groupby(group_cols, as_index=False, sort=False).agg(agg_dict)
 
         logger.info(
             f"Daily aggregation complete: {len(df)} rows -> {len(df_agg)} rows "
@@ -6,11 +6,18 @@ import pandas as pd
 from typing import List, Tuple
 import logging
 import re
+from functools import lru_cache
 from ..api.hubeau import HubEauClient
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _get_client() -> HubEauClient:
+    """Client Hub'Eau créé au premier appel puis réutilisé (session HTTP keep-alive)."""
+    return HubEauClient()
+
+
 def clean_bss_code(code: str) -> str:
     """
     Nettoie et normalise un code BSS.
@@ -174,7 +181,7 @@ def validate_station_codes(
 
     try:
         logger.debug("Testing codes with Hub'Eau Piezometry API")
-        client = HubEauClient()
+        client = _get_client()
         df_stations = client.get_stations(sample_codes)
 
         if df_stations.empty:
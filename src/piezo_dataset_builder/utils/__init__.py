@@ -1 +1 @@
-"""Module Utils - Utilitaires pour l'export de données."""
\ No newline at end of file
+"""Module Utils - Utilitaires pour l'export de données et le cache disque."""
\ No newline at end of file
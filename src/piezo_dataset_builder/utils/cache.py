@@ -0,0 +1,84 @@
+"""
+Cache disque simple pour les réponses API (clé → valeur JSON).
+
+Les fichiers sont nommés par le hash SHA-256 de la clé, ce qui évite les problèmes
+de caractères spéciaux (ex: "/" dans les codes BSS).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """
+    Stockage clé → valeur JSON sur disque, un fichier par clé.
+
+    Les écritures passent par un fichier temporaire puis os.replace : une lecture
+    concurrente voit soit l'ancienne valeur, soit la nouvelle, jamais un fichier partiel.
+    """
+
+    def __init__(self, cache_dir: str, namespace: str, max_age: Optional[float] = None):
+        """
+        Initialise le cache.
+
+        Args:
+            cache_dir: Répertoire racine du cache
+            namespace: Sous-répertoire (ex: "hubeau_stations")
+            max_age: Durée de validité des entrées en secondes (None = illimitée)
+        """
+        self.path = Path(cache_dir) / namespace
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+
+    def _file(self, key: str) -> Path:
+        return self.path / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Lit une entrée du cache.
+
+        Args:
+            key: Clé de l'entrée
+
+        Returns:
+            Valeur stockée, ou None si absente, expirée ou illisible
+        """
+        path = self._file(key)
+        try:
+            if self.max_age is not None and time.time() - path.stat().st_mtime > self.max_age:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable cache entry for '{key}': {e}")
+            return None
+
+    def set(self, key: str, value: Any):
+        """
+        Écrit une entrée dans le cache (les erreurs d'écriture sont journalisées, pas levées).
+
+        Args:
+            key: Clé de l'entrée
+            value: Valeur sérialisable en JSON
+        """
+        path = self._file(key)
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write cache entry for '{key}': {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
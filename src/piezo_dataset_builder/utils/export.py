@@ -3,7 +3,7 @@ Utilitaires pour l'export de données.
 """
 
 import pandas as pd
-from io import BytesIO, StringIO
+from io import BytesIO
 import logging
 from openpyxl.utils import get_column_letter
 
@@ -148,7 +148,8 @@ def get_export_stats(df: pd.DataFrame) -> dict:
     # Taux de valeurs manquantes
     total_cells = len(df) * len(df.columns)
     if total_cells > 0:
-        stats['taux_na'] = (df.isna().sum().sum() / total_cells) * 100
+        # Réduction unique sur le tableau NumPy (pas de Series intermédiaire par colonne)
+        stats['taux_na'] = (df.isna().to_numpy().sum() / total_cells) * 100
     else:
         stats['taux_na'] = 0.0
 
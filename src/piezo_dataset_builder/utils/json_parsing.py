@@ -0,0 +1,31 @@
+"""
+Décodage JSON des réponses HTTP, partagé par les clients API.
+"""
+
+from typing import Any
+
+import requests
+
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle (extra "fast")
+    orjson = None
+
+
+def parse_json(response: requests.Response) -> Any:
+    """
+    Décode le corps JSON d'une réponse.
+
+    Utilise orjson directement sur les octets si disponible (nettement plus rapide
+    sur les grosses réponses chroniques), sinon response.json().
+    orjson.JSONDecodeError hérite de ValueError, comme l'erreur de response.json().
+
+    Args:
+        response: Réponse HTTP
+
+    Returns:
+        Objet Python décodé
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
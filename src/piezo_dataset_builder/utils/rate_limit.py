@@ -0,0 +1,69 @@
+"""
+Limitation de débit des requêtes API (token bucket thread-safe).
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe.
+
+    Les jetons se rechargent à ``rate`` par seconde jusqu'à ``capacity`` ; chaque requête
+    en consomme un. Jusqu'à ``capacity`` requêtes partent donc sans attente (rafale),
+    puis le débit moyen est plafonné à ``rate``.
+
+    Un appelant sans jeton disponible réserve le sien (solde négatif) puis dort hors du
+    verrou : les threads concurrents ne sont pas bloqués par le sommeil des autres et
+    sont servis dans l'ordre d'arrivée.
+    """
+
+    def __init__(self, rate: Optional[float], capacity: float = 1.0):
+        """
+        Initialise le bucket.
+
+        Args:
+            rate: Jetons rechargés par seconde (None ou <= 0 = pas de limite)
+            capacity: Taille max de rafale (>= 1)
+        """
+        self.rate = rate if rate and rate > 0 else None
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_interval(cls, interval: float, capacity: float = 1.0) -> 'TokenBucket':
+        """
+        Crée un bucket à partir d'un délai minimum moyen entre requêtes.
+
+        Args:
+            interval: Secondes entre requêtes (<= 0 = pas de limite)
+            capacity: Taille max de rafale
+
+        Returns:
+            TokenBucket correspondant
+        """
+        return cls(1.0 / interval if interval > 0 else None, capacity)
+
+    def acquire(self, tokens: float = 1.0):
+        """
+        Consomme des jetons, en attendant si nécessaire.
+
+        Args:
+            tokens: Nombre de jetons à consommer
+        """
+        if self.rate is None:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)